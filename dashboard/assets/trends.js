@@ -0,0 +1,24 @@
+// Clientside callbacks for the fraud trend chart. The daily fraud counts are shipped once with the
+// layout (the 'trend-data' store), so filtering them by date needs no round trip to the server.
+window.dash_clientside = Object.assign({}, window.dash_clientside, {
+    trends: {
+        filterByDate: function(filterClicks, startDate, endDate, trendData) {
+            let dates = trendData.dates;
+            let counts = trendData.counts;
+
+            // Keep whole days between the two dates, both inclusive, as the server does
+            if (startDate && endDate) {
+                const start = startDate.slice(0, 10);
+                const end = endDate.slice(0, 10);
+                const keep = dates.map(date => date >= start && date <= end);
+                dates = dates.filter((_, i) => keep[i]);
+                counts = counts.filter((_, i) => keep[i]);
+            }
+
+            // Reuse the server-built figure, replacing only the plotted points
+            const figure = trendData.figure;
+            const trace = Object.assign({}, figure.data[0], {x: dates, y: counts});
+            return Object.assign({}, figure, {data: [trace]});
+        }
+    }
+});
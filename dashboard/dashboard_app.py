@@ -1,152 +1,166 @@
-from dash import Dash, html, dcc, Input, Output, State, callback_context
+from dash import Dash, html, dcc, Input, Output, State, ClientsideFunction, callback_context, no_update
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
 import pandas as pd
 from flask import Flask
+from flask_caching import Cache
+from flask_compress import Compress
 from datetime import datetime
-import socket
-import struct
+import hashlib
+import json
+import os
+import tempfile
+
+from data_processing import (
+    FRAUD_DATA_PATH, IP_COUNTRY_PATH, TOP_DEVICES, aggregate_date_range, compute_aggregates,
+    compute_daily_aggregates, downsample_lttb, get_cache_key, get_geo_counts, get_processed_data,
+    get_summary_stats, slice_date_range
+)
+
+# Serialize figures (and Dash callback responses, which go through plotly.io) with orjson
+pio.json.config.default_engine = 'orjson'
 
 # Initialize Flask app
 server = Flask(__name__)
 
+# Compress responses (figure JSON shrinks several-fold), preferring Brotli over gzip
+server.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+server.config['COMPRESS_LEVEL'] = 4
+server.config['COMPRESS_BR_LEVEL'] = 4
+server.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(server)
+
 # Initialize Dash app
 app = Dash(__name__, server=server)
 
-def ip_to_int(ip):
-    """
-    Converts an IPv4 address from its dotted-decimal string format to an integer.
+# Server-side cache for the generated figures, shared by all workers of this app. The directory is
+# specific to this checkout and to the version of the data, so other apps on the host never share it.
+FIGURE_CACHE_KEY = hashlib.md5(
+    f"{os.path.dirname(os.path.abspath(__file__))}:{get_cache_key([FRAUD_DATA_PATH, IP_COUNTRY_PATH])}".encode()
+).hexdigest()[:16]
+cache = Cache(server, config={
+    'CACHE_TYPE': 'FileSystemCache',
+    'CACHE_DIR': os.path.join(tempfile.gettempdir(), f'dash_cache_{FIGURE_CACHE_KEY}'),
+    'CACHE_DEFAULT_TIMEOUT': 3600
+})
 
-    Parameters:
-    ip (str): The IPv4 address in dotted-decimal string format (e.g., "192.168.1.1").
+# Upper bound on the number of points sent to the browser for the fraud trend line
+MAX_TREND_POINTS = 1000
 
-    Returns:
-    int: The integer representation of the IPv4 address.
-    None: If the input is not a valid IPv4 address.
-    """
-    try:
-        # Convert the IP address string to a 32-bit packed binary format and unpack it as an integer.
-        return struct.unpack("!I", socket.inet_aton(ip))[0]
-    except socket.error:
-        # Return None if the IP address is invalid.
-        return None
+# Load and process data
+fraud_data_processed = get_processed_data()
+ecom_stats, credit_stats = get_summary_stats()
 
+# Aggregate the unfiltered data once; callbacks reuse it whenever no filter is applied.
+chart_aggregates = compute_aggregates(fraud_data_processed)
 
-def load_data():
-    """
-    Loads datasets required for analysis or processing from CSV files.
+# Per-day aggregates that date-range filters slice instead of regrouping the transactions.
+daily_aggregates = compute_daily_aggregates(fraud_data_processed)
 
-    Returns:
-    tuple: A tuple containing three pandas DataFrames:
-        - fraud_data: DataFrame containing information about fraudulent activities.
-        - credit_data: DataFrame containing credit card transaction data.
-        - ip_country: DataFrame mapping IP addresses to country information.
-    """
-    # Load the fraud data dataset from the specified CSV file.
-    fraud_data = pd.read_csv('data/Fraud_Data.csv')
-    
-    # Load the credit card transaction data from the specified CSV file.
-    credit_data = pd.read_csv('data/render_creditcard.csv')
-    
-    # Load the IP-to-country mapping dataset from the specified CSV file.
-    ip_country = pd.read_csv('data/IpAddress_to_Country.csv')
-    
-    # Return all three datasets as a tuple of DataFrames.
-    return fraud_data, credit_data, ip_country
-
-
-def process_ecommerce_data(fraud_data, ip_country):
-    """
-    Processes eCommerce data to clean, enrich, and integrate fraud data with IP-to-country mappings.
+# Drop figures memoized by a previous run of this app, which may have been built by older code.
+# The directory belongs to this app and data version only, so nothing else is cleared.
+cache.clear()
 
-    Parameters:
-    fraud_data (DataFrame): A pandas DataFrame containing fraud-related eCommerce data.
-    ip_country (DataFrame): A pandas DataFrame mapping IP address ranges to countries.
 
+# Build the geographical distribution chart
+def initialize_geo_chart():
+    """
+    Initializes a geographical chart (choropleth map) that visualizes fraud cases by country.
+        
     Returns:
-    DataFrame: A cleaned and enriched DataFrame that includes fraud data with corresponding country information.
+        geo_fig (plotly.graph_objs._figure.Figure): Choropleth map showing fraud cases by country.
     """
-    # Create a copy of the input DataFrames to avoid modifying the originals.
-    fraud_data_cleaned = fraud_data.copy()
-    ip_country_cleaned = ip_country.copy()
-
-    # Convert signup and purchase time columns to datetime format.
-    fraud_data_cleaned['signup_time'] = pd.to_datetime(fraud_data_cleaned['signup_time'])
-    fraud_data_cleaned['purchase_time'] = pd.to_datetime(fraud_data_cleaned['purchase_time'])
-    
-    # Extract the day of the week and the hour of the purchase from the purchase time.
-    fraud_data_cleaned['purchase_day'] = fraud_data_cleaned['purchase_time'].dt.day_name()
-    fraud_data_cleaned['purchase_hour'] = fraud_data_cleaned['purchase_time'].dt.hour
-
-    # Convert IP addresses to integer format using the ip_to_int function.
-    fraud_data_cleaned['ip_int'] = fraud_data_cleaned['ip_address'].apply(
-        lambda x: ip_to_int(str(int(x))) if pd.notna(x) else None
-    )
 
-    # Ensure IP address range columns in the IP-country data are integers.
-    ip_country_cleaned['lower_bound_ip_address'] = ip_country_cleaned['lower_bound_ip_address'].astype('int64')
-    ip_country_cleaned['upper_bound_ip_address'] = ip_country_cleaned['upper_bound_ip_address'].astype('int64')
-    fraud_data_cleaned['ip_int'] = fraud_data_cleaned['ip_int'].astype('int64')
-
-    # Sort the IP-country data by the lower bound for efficient merging.
-    ip_country_cleaned.sort_values('lower_bound_ip_address', inplace=True)
-
-    # Use a merge_asof to map each fraud_data IP to the appropriate country based on IP ranges.
-    fraud_data_with_country = pd.merge_asof(
-        fraud_data_cleaned.sort_values('ip_int'),  # Sort fraud data by IP integer.
-        ip_country_cleaned[['lower_bound_ip_address', 'upper_bound_ip_address', 'country']],
-        left_on='ip_int',  # Match based on the integer IP address.
-        right_on='lower_bound_ip_address',  # Match against the lower bound of the IP range.
-        direction='backward'  # Ensure backward merging to find the closest lower bound.
+    # Create a choropleth map from the cached fraud case counts per country
+    geo_fig = px.choropleth(
+        get_geo_counts(),
+
+        # Specify the column representing countries
+        locations='country',
+        locationmode='country names',  # Use country names as identifiers for locations
+
+        # Specify the column representing the fraud case count
+        color='count',
+
+        # Define the color scale for the choropleth
+        color_continuous_scale='Reds',  # Red tones to highlight fraud intensity
+
+        # Set a default template for the plot
+        template='plotly_white',
+
+        # Label the color legend
+        labels={'count': 'Fraud Cases'},
+
+        # Use the country name for hover information
+        hover_name='country'
+    ).update_layout(
+        # Configure map appearance
+        geo=dict(
+            showframe=False,             # Remove the map frame
+            showcoastlines=True,         # Display coastlines
+            projection_type='natural earth',  # Use natural earth projection
+            landcolor='whitesmoke',      # Set land color
+            lakecolor='white',           # Set lake color
+            showocean=True,              # Display ocean
+            oceancolor='aliceblue'       # Set ocean color
+        ),
+
+        # Adjust the chart margins
+        margin=dict(l=10, r=10, t=40, b=10),
+
+        # Customize the color axis colorbar
+        coloraxis_colorbar=dict(
+            title="Fraud Cases",         # Title for the colorbar
+            titlefont=dict(size=12),     # Font size for the title
+            tickvals=[100, 1000, 3000, 4000, 5500],  # Custom tick values
+            tickformat=',d',             # Format tick values with commas for readability
+            thickness=12,                # Thickness of the colorbar
+            len=0.5                      # Length of the colorbar as a fraction of the plot height
+        )
+    ).update_traces(
+        # Configure hover information template for each country
+        hovertemplate="<b>Country:</b> %{location}<br><b>Fraud Cases:</b> %{z}<extra></extra>"
     )
 
-    # Filter rows to ensure the IP integer falls within the valid IP range.
-    fraud_data_with_country = fraud_data_with_country[
-        (fraud_data_with_country['ip_int'] >= fraud_data_with_country['lower_bound_ip_address']) &
-        (fraud_data_with_country['ip_int'] <= fraud_data_with_country['upper_bound_ip_address'])
-    ]
+    # Return the generated geographical chart
+    return geo_fig
+
 
-    # Drop unnecessary columns related to IP address ranges after merging.
-    fraud_data_with_country.drop(['lower_bound_ip_address', 'upper_bound_ip_address'], axis=1, inplace=True)
+# The choropleth never changes, so build it once at startup and ship it with the layout.
+geo_fig = initialize_geo_chart()
 
-    # Return the processed DataFrame enriched with country information.
-    return fraud_data_with_country
 
-def create_summary_stats(fraud_data, credit_data):
+def build_trend_figure(aggregates):
     """
-    Creates summary statistics for eCommerce fraud data and credit card transaction data.
+    Builds a line chart of the daily fraud cases, decimated to what the chart can actually display.
 
-    Parameters:
-    fraud_data (DataFrame): A pandas DataFrame containing eCommerce fraud-related transactions.
-                           Assumes the 'class' column indicates fraud (1 for fraud, 0 otherwise).
-    credit_data (DataFrame): A pandas DataFrame containing credit card transaction data.
-                             Assumes the 'Class' column indicates fraud (1 for fraud, 0 otherwise).
+    Args:
+        aggregates (dict): Chart aggregates, as returned by get_aggregates.
 
     Returns:
-    tuple: A tuple containing two dictionaries:
-        - ecom_stats: Summary statistics for the eCommerce fraud data.
-        - credit_stats: Summary statistics for the credit card transaction data.
+        plotly.graph_objs._figure.Figure: Line chart with the fraud cases in red.
     """
-    # Calculate summary statistics for the eCommerce fraud data.
-    ecom_stats = {
-        'total_transactions': len(fraud_data),  # Total number of transactions in the dataset.
-        'fraud_cases': fraud_data['class'].sum(),  # Total number of fraudulent transactions.
-        'fraud_percentage': (fraud_data['class'].sum() / len(fraud_data) * 100).round(2)  # Percentage of fraud cases.
-    }
-
-    # Calculate summary statistics for the credit card transaction data.
-    credit_stats = {
-        'total_transactions': len(credit_data),  # Total number of transactions in the dataset.
-        'fraud_cases': credit_data['Class'].sum(),  # Total number of fraudulent transactions.
-        'fraud_percentage': (credit_data['Class'].sum() / len(credit_data) * 100).round(2)  # Percentage of fraud cases.
-    }
-
-    # Return the summary statistics for both datasets.
-    return ecom_stats, credit_stats
+    trend = downsample_lttb(aggregates['trend'], 'purchase_time', 'class', MAX_TREND_POINTS)
+    return go.Figure(
+        go.Scatter(
+            x=trend['purchase_time'].to_numpy(), y=trend['class'].to_numpy(), mode='lines', name='Fraud cases',
+            line_color='#e74c3c', showlegend=False  # Highlight fraud cases in red
+        ),
+        layout=dict(
+            template='plotly_white', margin=dict(t=60), xaxis_title='Purchase Date', yaxis_title='Fraud Cases'
+        )
+    )
 
-# Load and process data
-fraud_data, credit_data, ip_country = load_data()
-fraud_data_processed = process_ecommerce_data(fraud_data, ip_country)
-ecom_stats, credit_stats = create_summary_stats(fraud_data_processed, credit_data)
+
+# Daily fraud counts shipped with the layout, so date-range filtering of the trend chart runs in the
+# browser (see assets/trends.js). The daily series is far shorter than MAX_TREND_POINTS, so the
+# browser plots it without downsampling.
+trend_data = {
+    'figure': json.loads(pio.to_json(build_trend_figure(chart_aggregates))),
+    'dates': chart_aggregates['trend']['purchase_time'].dt.strftime('%Y-%m-%d').tolist(),
+    'counts': chart_aggregates['trend']['class'].tolist()
+}
 
 # App layout definition
 app.layout = html.Div([
@@ -239,7 +253,8 @@ app.layout = html.Div([
             # Fraud trends over time
             html.Div([
                 html.H3('Fraud Trends Over Time', className='chart-title'),  # Title
-                dcc.Graph(id='fraud-trends')  # Placeholder for the fraud trends graph
+                dcc.Graph(id='fraud-trends'),  # Placeholder for the fraud trends graph
+                dcc.Store(id='trend-data', data=trend_data)  # Daily fraud counts for clientside filtering
             ], className='chart-card mb-4'),
 
             # Geographical distribution of fraud
@@ -249,7 +264,7 @@ app.layout = html.Div([
                     className='chart-title', 
                     style={'textAlign': 'center', 'marginBottom': '15px'}
                 ),
-                dcc.Graph(id='geo-distribution', className='chart-card mb-4')  # Placeholder for the geographical distribution graph
+                dcc.Graph(id='geo-distribution', figure=geo_fig, className='chart-card mb-4')  # Geographical distribution graph
             ], style={
                 'padding': '20px', 
                 'backgroundColor': 'white', 
@@ -261,7 +276,7 @@ app.layout = html.Div([
             html.Div([
                 # Fraud by device
                 html.Div([
-                    html.H3('Fraud by Device', className='chart-title'),  # Title
+                    html.H3(f'Fraud by Device (Top {TOP_DEVICES})', className='chart-title'),  # Title; only the busiest devices are charted
                     dcc.Graph(id='fraud-device')  # Placeholder for the device graph
                 ], className='chart-card col-md-6'),
 
@@ -291,49 +306,138 @@ app.layout = html.Div([
 ])
 
 
-# Callbacks for interactivity
-@app.callback(
-    [
-        Output('fraud-trends', 'figure'),
-        Output('fraud-device', 'figure'),
-        Output('fraud-browser', 'figure'),
-        Output('fraud-hour', 'figure'),
-        Output('fraud-day', 'figure'),
-        Output('alert-message', 'children'),
-        Output('alert-message', 'style'),
-    ],
-    [
-        Input('filter-button', 'n_clicks'),
-        Input('reset-button', 'n_clicks'),
-        Input('geo-distribution', 'clickData')
-    ],
-    [
-        State('date-filter', 'start_date'),
-        State('date-filter', 'end_date')
-    ]
-)
+@cache.memoize()
+def get_aggregates(start_date=None, end_date=None, country=None):
+    """
+    Computes the chart aggregates for the given filters. Results are memoized, so later requests
+    for the same filters skip the pandas aggregation. The chart callbacks of one interaction run
+    concurrently, though, so on a cache miss each of them may compute the aggregates itself.
+
+    Args:
+        start_date (Timestamp, optional): First purchase date to include (whole day).
+        end_date (Timestamp, optional): Last purchase date to include (whole day).
+        country (str, optional): Country to restrict the transactions to.
+
+    Returns:
+        dict: Aggregated frames keyed by chart, as returned by compute_aggregates.
+    """
+    has_date_range = start_date is not None and end_date is not None
+
+    if country:
+        # Filter the transactions themselves based on the date range (if any) and the selected country
+        filtered_data = fraud_data_processed
+        if has_date_range:
+            filtered_data = slice_date_range(filtered_data, start_date, end_date)
+        filtered_data = filtered_data[filtered_data['country'] == country]
+        return compute_aggregates(filtered_data)
+    elif has_date_range:
+        # Slice the per-day aggregates to the date range
+        return aggregate_date_range(daily_aggregates, start_date, end_date)
+
+    # Reuse the startup aggregates when no filter is applied
+    return chart_aggregates
 
 
+# Legend name and bar colour of each transaction class
+CLASS_NAMES = {0: 'Legitimate', 1: 'Fraud'}
+CLASS_COLORS = {0: '#2ecc71', 1: '#e74c3c'}
 
-def update_charts(filter_clicks, reset_clicks, geo_click_data, start_date, end_date):
+
+def build_class_bar_figure(counts, xaxis_title):
     """
-    Updates the charts displayed in the dashboard based on user interactions such as applying filters,
-    resetting filters, or selecting geographical data. Returns updated charts and an alert message.
+    Builds a stacked bar chart of transaction counts split by class.
+
+    Args:
+        counts (DataFrame): Transaction counts indexed by category, with one column per class.
+        xaxis_title (str): Title of the category axis.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Bar chart with legitimate cases in green and fraud in red.
+    """
+    categories = counts.index.to_numpy()
+    return go.Figure(
+        [
+            go.Bar(
+                x=categories, y=counts[label].to_numpy(), name=CLASS_NAMES.get(label, str(label)),
+                marker_color=CLASS_COLORS.get(label)
+            )
+            for label in counts.columns
+        ],
+        layout=dict(
+            template='plotly_white', margin=dict(t=60), barmode='relative', legend_title_text='Class',
+            xaxis_title=xaxis_title, yaxis_title='Transactions'
+        )
+    )
+
+
+def build_fraud_bar_figure(fraud_counts, xaxis_title):
+    """
+    Builds a bar chart of fraud case counts.
+
+    Args:
+        fraud_counts (Series): Number of fraud cases indexed by category.
+        xaxis_title (str): Title of the category axis.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: Bar chart with the fraud cases in red.
+    """
+    return go.Figure(
+        go.Bar(
+            x=fraud_counts.index.to_numpy(), y=fraud_counts.to_numpy(), name='Fraud cases',
+            marker_color=CLASS_COLORS[1]
+        ),
+        layout=dict(
+            template='plotly_white', margin=dict(t=60), xaxis_title=xaxis_title, yaxis_title='Number of Fraud Cases'
+        )
+    )
+
+
+# Figure builder for each chart, keyed by the ID of the graph it fills
+FIGURE_BUILDERS = {
+    'fraud-trends': build_trend_figure,
+    'fraud-device': lambda aggregates: build_class_bar_figure(aggregates['device'], 'Device'),
+    'fraud-browser': lambda aggregates: build_class_bar_figure(aggregates['browser'], 'Browser'),
+    'fraud-hour': lambda aggregates: build_fraud_bar_figure(aggregates['hour'], 'Hour of Day'),
+    'fraud-day': lambda aggregates: build_fraud_bar_figure(aggregates['day'], 'Day of Week')
+}
+
+
+@cache.memoize()
+def build_figure(graph_id, start_date=None, end_date=None, country=None):
+    """
+    Builds a single chart for the given filters. Results are memoized, so repeating a filter
+    skips both the pandas aggregation and the figure construction.
+
+    Args:
+        graph_id (str): ID of the graph to build the figure for (a key of FIGURE_BUILDERS).
+        start_date (Timestamp, optional): First purchase date to include (whole day).
+        end_date (Timestamp, optional): Last purchase date to include (whole day).
+        country (str, optional): Country to restrict the transactions to.
+
+    Returns:
+        plotly.graph_objs._figure.Figure: The chart figure.
+    """
+    return FIGURE_BUILDERS[graph_id](get_aggregates(start_date, end_date, country))
+
+
+def resolve_filters(geo_click_data, start_date, end_date):
+    """
+    Resolves the filters selected by the interaction that triggered the current callback.
 
     Args:
-        filter_clicks (int): Number of clicks on the filter button.
-        reset_clicks (int): Number of clicks on the reset button.
         geo_click_data (dict): Data from a geographical chart click event.
         start_date (str): Start date for filtering in 'YYYY-MM-DD' format.
         end_date (str): End date for filtering in 'YYYY-MM-DD' format.
 
     Returns:
-        tuple: Contains updated figures for charts, alert message, and alert style.
+        tuple: Start date, end date and country to filter on (None when not filtered), followed by
+               the alert message and alert style describing them.
     """
 
     # Initialize context and defaults
     ctx = callback_context
-    filtered_data = fraud_data_processed  # Default to the entire dataset
+    start = end = None  # Date range selected with the filter button, if any
+    country = None  # Country selected on the map, if any
     alert_message = ""  # Message to be displayed as a user alert
     alert_style = {'display': 'none'}  # Default style for alert (hidden)
 
@@ -350,17 +454,11 @@ def update_charts(filter_clicks, reset_clicks, geo_click_data, start_date, end_d
         # Apply date range filter if the filter button is clicked and dates are provided
         if button_id == 'filter-button' and start_date and end_date:
             # Convert start_date and end_date to datetime objects
-            start_date = pd.to_datetime(start_date)
-            end_date = pd.to_datetime(end_date)
-
-            # Filter data based on the date range
-            filtered_data = fraud_data_processed[
-                (fraud_data_processed['purchase_time'] >= start_date) &
-                (fraud_data_processed['purchase_time'] <= end_date)
-            ]
+            start = pd.to_datetime(start_date)
+            end = pd.to_datetime(end_date)
 
             # Update alert message to indicate successful filtering
-            alert_message = f"Filters applied from {start_date.date()} to {end_date.date()}."
+            alert_message = f"Filters applied from {start.date()} to {end.date()}."
             alert_style = {'display': 'block', 'color': 'green'}
 
         # Apply geographical filter if a country is clicked on the map
@@ -368,9 +466,6 @@ def update_charts(filter_clicks, reset_clicks, geo_click_data, start_date, end_d
             try:
                 # Extract the clicked country's location
                 country = geo_click_data['points'][0]['location']
-
-                # Filter data based on the selected country
-                filtered_data = filtered_data[filtered_data['country'] == country]
                 alert_message = f"Filtered by country: {country}"
                 alert_style = {'display': 'block', 'color': 'green'}
             except (KeyError, IndexError):
@@ -378,130 +473,107 @@ def update_charts(filter_clicks, reset_clicks, geo_click_data, start_date, end_d
                 alert_message = "Error retrieving country data."
                 alert_style = {'display': 'block', 'color': 'red'}
 
-    # Generate updated figures based on the filtered data
-    try:
-        # Line chart for fraud trends over time
-        fraud_trends_fig = px.line(
-            filtered_data.groupby(filtered_data['purchase_time'].dt.date)['class'].sum().reset_index(),
-            x='purchase_time', y='class', template='plotly_white'
-        ).update_traces(line_color='#e74c3c')  # Highlight fraud cases in red
-
-        # Bar chart for fraud cases by device ID
-        fraud_device_fig = px.bar(
-            filtered_data.groupby(['device_id', 'class']).size().unstack().fillna(0),
-            template='plotly_white', color_discrete_sequence=['#2ecc71', '#e74c3c']
-        )
+    return start, end, country, alert_message, alert_style
 
-        # Bar chart for fraud cases by browser
-        fraud_browser_fig = px.bar(
-            filtered_data.groupby(['browser', 'class']).size().unstack().fillna(0),
-            template='plotly_white', color_discrete_sequence=['#2ecc71', '#e74c3c']
-        )
 
-        # Bar chart for fraud cases by hour of the day
-        fraud_hour_fig = px.bar(
-            filtered_data[filtered_data['class'] == 1].groupby('purchase_hour').size(),
-            template='plotly_white', color_discrete_sequence=['#e74c3c']
-        ).update_layout(
-            xaxis_title='Hour of Day',
-            yaxis_title='Number of Fraud Cases'
-        )
+# Inputs shared by the chart and alert callbacks
+FILTER_INPUTS = [
+    Input('filter-button', 'n_clicks'),
+    Input('reset-button', 'n_clicks'),
+    Input('geo-distribution', 'clickData')
+]
+FILTER_STATES = [
+    State('date-filter', 'start_date'),
+    State('date-filter', 'end_date')
+]
 
-        # Bar chart for fraud cases by day of the week
-        fraud_day_fig = px.bar(
-            filtered_data[filtered_data['class'] == 1].groupby('purchase_day').size(),
-            template='plotly_white', color_discrete_sequence=['#e74c3c']
-        ).update_layout(
-            xaxis_title='Day of Week',
-            yaxis_title='Number of Fraud Cases'
-        )
-    except Exception as e:
-        # Handle errors during figure generation
-        print(f"Error generating figures: {e}")
-        alert_message = "Error updating charts. Please check the data or filters."
-        alert_style = {'display': 'block', 'color': 'red'}
+# The trend chart is filtered by date in the browser, so its server callback skips the filter button
+TREND_INPUTS = [
+    Input('reset-button', 'n_clicks'),
+    Input('geo-distribution', 'clickData')
+]
 
-        # Return empty figures in case of error
-        fraud_trends_fig = fraud_device_fig = fraud_browser_fig = fraud_hour_fig = fraud_day_fig = {}
 
-    # Return all updated charts, alert message, and alert style
-    return fraud_trends_fig, fraud_device_fig, fraud_browser_fig, fraud_hour_fig, fraud_day_fig, alert_message, alert_style
+# Callbacks for interactivity. Each chart has its own callback, so a multi-worker server can
+# build the five figures in parallel instead of one after the other.
+def register_chart_callback(graph_id, inputs):
+    """
+    Registers the callback that updates one chart when the filters change.
+
+    Args:
+        graph_id (str): ID of the graph to update (a key of FIGURE_BUILDERS).
+        inputs (list): Inputs triggering the update; the map click must be the last of them.
+    """
+    @app.callback(
+        [
+            Output(graph_id, 'figure'),
+            # A failed chart also reports itself in the alert shared with update_alert
+            Output('alert-message', 'children', allow_duplicate=True),
+            Output('alert-message', 'style', allow_duplicate=True)
+        ],
+        inputs,
+        FILTER_STATES,
+        prevent_initial_call='initial_duplicate'
+    )
+    def update_chart(*args):
+        # Input values come first (ending with the map click data), followed by the two dates
+        geo_click_data, start_date, end_date = args[-3:]
+        start, end, country, _, _ = resolve_filters(geo_click_data, start_date, end_date)
+
+        # Build (or fetch from the cache) the figure for the selected filters
+        try:
+            return build_figure(graph_id, start, end, country), no_update, no_update
+        except Exception as e:
+            # Show the error in the alert and in place of the chart, which keeps it visible even if the
+            # alert is overwritten by update_alert for the same interaction
+            print(f"Error generating {graph_id} figure: {e}")
+            error_figure = go.Figure(layout=dict(
+                template='plotly_white', xaxis_visible=False, yaxis_visible=False,
+                annotations=[dict(text='Error updating this chart.', showarrow=False, font=dict(color='red'))]
+            ))
+            alert_message = "Error updating charts. Please check the data or filters."
+            return error_figure, alert_message, {'display': 'block', 'color': 'red'}
+
+
+for graph_id in FIGURE_BUILDERS:
+    register_chart_callback(graph_id, TREND_INPUTS if graph_id == 'fraud-trends' else FILTER_INPUTS)
+
+
+# Date-range filtering of the trend chart only slices the daily counts, so it runs in the browser
+app.clientside_callback(
+    ClientsideFunction(namespace='trends', function_name='filterByDate'),
+    Output('fraud-trends', 'figure', allow_duplicate=True),
+    Input('filter-button', 'n_clicks'),
+    FILTER_STATES + [State('trend-data', 'data')],
+    prevent_initial_call=True
+)
 
 
-# Initialize geographical distribution chart
 @app.callback(
-    Output('geo-distribution', 'figure'),
-    Input('geo-distribution', 'id')
+    [
+        Output('alert-message', 'children'),
+        Output('alert-message', 'style'),
+    ],
+    FILTER_INPUTS,
+    FILTER_STATES
 )
-def initialize_geo_chart(_):
+def update_alert(filter_clicks, reset_clicks, geo_click_data, start_date, end_date):
     """
-    Initializes a geographical chart (choropleth map) that visualizes fraud cases by country.
-    
+    Updates the alert message based on user interactions such as applying filters, resetting
+    filters, or selecting geographical data.
+
     Args:
-        _ (any): Placeholder for callback input, not used in this function.
-        
+        filter_clicks (int): Number of clicks on the filter button.
+        reset_clicks (int): Number of clicks on the reset button.
+        geo_click_data (dict): Data from a geographical chart click event.
+        start_date (str): Start date for filtering in 'YYYY-MM-DD' format.
+        end_date (str): End date for filtering in 'YYYY-MM-DD' format.
+
     Returns:
-        geo_fig (plotly.graph_objs._figure.Figure): Choropleth map showing fraud cases by country.
+        tuple: Contains the alert message and alert style.
     """
-
-    # Create a choropleth map using fraud data filtered for fraudulent transactions (class == 1)
-    geo_fig = px.choropleth(
-        # Group data by country and count the number of fraud cases
-        fraud_data_processed[fraud_data_processed['class'] == 1]
-        .groupby('country')
-        .size()
-        .reset_index(name='count'),  # Rename the grouped column to 'count'
-
-        # Specify the column representing countries
-        locations='country',
-        locationmode='country names',  # Use country names as identifiers for locations
-
-        # Specify the column representing the fraud case count
-        color='count',
-
-        # Define the color scale for the choropleth
-        color_continuous_scale='Reds',  # Red tones to highlight fraud intensity
-
-        # Set a default template for the plot
-        template='plotly_white',
-
-        # Label the color legend
-        labels={'count': 'Fraud Cases'},
-
-        # Use the country name for hover information
-        hover_name='country'
-    ).update_layout(
-        # Configure map appearance
-        geo=dict(
-            showframe=False,             # Remove the map frame
-            showcoastlines=True,         # Display coastlines
-            projection_type='natural earth',  # Use natural earth projection
-            landcolor='whitesmoke',      # Set land color
-            lakecolor='white',           # Set lake color
-            showocean=True,              # Display ocean
-            oceancolor='aliceblue'       # Set ocean color
-        ),
-
-        # Adjust the chart margins
-        margin=dict(l=10, r=10, t=40, b=10),
-
-        # Customize the color axis colorbar
-        coloraxis_colorbar=dict(
-            title="Fraud Cases",         # Title for the colorbar
-            titlefont=dict(size=12),     # Font size for the title
-            tickvals=[100, 1000, 3000, 4000, 5500],  # Custom tick values
-            tickformat=',d',             # Format tick values with commas for readability
-            thickness=12,                # Thickness of the colorbar
-            len=0.5                      # Length of the colorbar as a fraction of the plot height
-        )
-    ).update_traces(
-        # Configure hover information template for each country
-        hovertemplate="<b>Country:</b> %{location}<br><b>Fraud Cases:</b> %{z}<extra></extra>"
-    )
-
-    # Return the generated geographical chart
-    return geo_fig
-
+    _, _, _, alert_message, alert_style = resolve_filters(geo_click_data, start_date, end_date)
+    return alert_message, alert_style
 
 
 app.index_string = '''
@@ -525,7 +597,9 @@ app.index_string = '''
 '''
 
 
-# Run app
+# Run app with the Flask development server; deploy with gunicorn instead
 if __name__ == '__main__':
-    app.run_server(debug=True)
+    print("Development server only. In production run: gunicorn --config gunicorn.conf.py dashboard_app:server")
+    # The reloader would re-import this module in a child process, loading the data twice
+    app.run_server(debug=True, use_reloader=False)
 
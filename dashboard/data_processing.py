@@ -0,0 +1,518 @@
+"""
+Data loading and preprocessing shared by the fraud detection dashboard.
+"""
+import functools
+import glob
+import hashlib
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pa_csv
+
+# Source datasets and the directory holding the processed Parquet cache
+FRAUD_DATA_PATH = 'data/Fraud_Data.csv'
+CREDIT_DATA_PATH = 'data/render_creditcard.csv'
+IP_COUNTRY_PATH = 'data/IpAddress_to_Country.csv'
+CACHE_DIR = 'data'
+
+# Number of devices shown in the fraud-by-device chart
+TOP_DEVICES = 20
+
+# Version of the cached frame's layout; bump it whenever process_ecommerce_data changes its output
+CACHE_VERSION = 6
+
+# Days of the week in calendar order, so day-of-week charts list them Monday to Sunday
+WEEKDAY_DTYPE = pd.CategoricalDtype(
+    ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday'], ordered=True
+)
+
+# Timestamp layout used by signup_time and purchase_time in Fraud_Data.csv
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Explicit column types for the PyArrow CSV reader, so no column has to be inferred. Only the
+# Fraud_Data.csv columns the dashboard uses are read; strings are dictionary-encoded on load.
+FRAUD_DATA_TYPES = {
+    'purchase_time': pa.timestamp('s'),
+    'device_id': pa.dictionary(pa.int32(), pa.string()),
+    'browser': pa.dictionary(pa.int32(), pa.string()),
+    'ip_address': pa.float64(),
+    'class': pa.int8()
+}
+IP_COUNTRY_TYPES = {
+    'lower_bound_ip_address': pa.float64(),
+    'upper_bound_ip_address': pa.int64(),
+    'country': pa.string()
+}
+
+def load_data():
+    """
+    Loads datasets required for analysis or processing from CSV files. The files are parsed by
+    the multi-threaded PyArrow reader with explicit column types, so purchase_time arrives already
+    converted to datetimes. Only the fraud data columns listed in FRAUD_DATA_TYPES are loaded.
+
+    The credit card data is not loaded here; see summarize_credit_data.
+
+    Returns:
+    tuple: A tuple containing two pandas DataFrames:
+        - fraud_data: DataFrame containing information about fraudulent activities.
+        - ip_country: DataFrame mapping IP addresses to country information.
+    """
+    # Load the fraud data dataset from the specified CSV file.
+    fraud_data = pa_csv.read_csv(
+        FRAUD_DATA_PATH,
+        convert_options=pa_csv.ConvertOptions(
+            column_types=FRAUD_DATA_TYPES,
+            include_columns=list(FRAUD_DATA_TYPES),
+            timestamp_parsers=[TIMESTAMP_FORMAT]
+        )
+    ).to_pandas()
+    
+    # Load the IP-to-country mapping dataset from the specified CSV file.
+    ip_country = pa_csv.read_csv(
+        IP_COUNTRY_PATH, convert_options=pa_csv.ConvertOptions(column_types=IP_COUNTRY_TYPES)
+    ).to_pandas()
+    
+    # Return both datasets as a tuple of DataFrames.
+    return fraud_data, ip_country
+
+
+def summarize_credit_data(path, block_size=1 << 24):
+    """
+    Counts credit card transactions and fraud cases by streaming the CSV in blocks, so the
+    full file is never held in memory.
+
+    Parameters:
+    path (str): Path to the credit card transaction CSV. Its 'Class' column indicates fraud.
+    block_size (int): Number of bytes parsed per block.
+
+    Returns:
+    tuple: The total number of transactions and the number of fraudulent transactions.
+    """
+    total = frauds = 0
+
+    # Only the 'Class' column is converted; each record batch is discarded after it is counted.
+    reader = pa_csv.open_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=block_size),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={'Class': pa.int8()}, include_columns=['Class']
+        )
+    )
+    for batch in reader:
+        total += batch.num_rows
+        frauds += pc.sum(batch.column('Class')).as_py() or 0
+
+    return total, frauds
+
+
+def process_ecommerce_data(fraud_data, ip_country):
+    """
+    Processes eCommerce data to clean, enrich, and integrate fraud data with IP-to-country mappings.
+
+    Parameters:
+    fraud_data (DataFrame): A pandas DataFrame containing fraud-related eCommerce data,
+                           with purchase_time already parsed as datetimes.
+    ip_country (DataFrame): A pandas DataFrame mapping IP address ranges to countries.
+
+    Returns:
+    DataFrame: A cleaned and enriched DataFrame that includes fraud data with corresponding country information,
+               sorted by purchase_time.
+    """
+    # Convert IP addresses to integer format. The IPs are already stored as numeric values,
+    # so a single vectorized cast is enough.
+    # Missing IPs become -1, which sorts before every range and is therefore never matched.
+    ips = fraud_data['ip_address'].fillna(-1).to_numpy().astype('int64')
+
+    # Sort the IP ranges by lower bound so they can be binary-searched. Working on the underlying
+    # arrays leaves both input frames untouched without copying them.
+    order = np.argsort(ip_country['lower_bound_ip_address'].to_numpy(), kind='stable')
+    lower = ip_country['lower_bound_ip_address'].to_numpy()[order].astype('int64')
+    upper = ip_country['upper_bound_ip_address'].to_numpy()[order].astype('int64')
+    countries = ip_country['country'].to_numpy()[order]
+
+    # Find the last range whose lower bound is at or below each IP address.
+    idx = np.searchsorted(lower, ips, side='right') - 1
+
+    # Keep only the IP addresses that fall inside the range they were matched to.
+    valid = (idx >= 0) & (ips <= upper[idx.clip(0)])
+
+    # Select the valid rows once, ordered by purchase time so that date ranges can be sliced with a
+    # binary search. Every derived column is added to that new frame only.
+    rows = np.flatnonzero(valid)
+    rows = rows[np.argsort(fraud_data['purchase_time'].to_numpy()[rows], kind='stable')]
+    fraud_data_with_country = fraud_data.take(rows).reset_index(drop=True)
+
+    # Extract the calendar day, the day of the week and the hour of the purchase from the purchase
+    # time. The day name only has seven values, so store it as a category in weekday order.
+    purchase_time = fraud_data_with_country['purchase_time'].dt
+    fraud_data_with_country['purchase_date'] = purchase_time.normalize()
+    fraud_data_with_country['purchase_day'] = purchase_time.day_name().astype(WEEKDAY_DTYPE)
+    fraud_data_with_country['purchase_hour'] = purchase_time.hour
+    # Matched addresses are valid IPv4 values, so they fit in 32 bits.
+    fraud_data_with_country['ip_int'] = ips[rows].astype('uint32')
+
+    # Attach the matching country to each row.
+    fraud_data_with_country['country'] = countries[idx[rows]]
+
+    # Store the repeated strings as categories and downcast the small integer columns. Dictionary-encoded
+    # CSV columns list their categories in order of first appearance, so sort them alphabetically.
+    for col in ['country', 'device_id', 'browser']:
+        categorical = fraud_data_with_country[col].astype('category')
+        fraud_data_with_country[col] = categorical.cat.reorder_categories(categorical.cat.categories.sort_values())
+    fraud_data_with_country['class'] = fraud_data_with_country['class'].astype('int8')
+    fraud_data_with_country['purchase_hour'] = fraud_data_with_country['purchase_hour'].astype('int8')
+
+    # Return the processed DataFrame enriched with country information.
+    return fraud_data_with_country
+
+def get_cache_key(csv_paths):
+    """
+    Builds a key identifying the current version of data derived from the given CSV files.
+
+    Parameters:
+    csv_paths (list): Paths of the CSV files the data is derived from.
+
+    Returns:
+    str: Hex digest that changes with CACHE_VERSION and the source files' modification times.
+    """
+    # Key the cache on the layout version, the source files and their modification times.
+    key_source = (CACHE_VERSION, sorted((p, os.path.getmtime(p)) for p in csv_paths))
+    return hashlib.md5(str(key_source).encode()).hexdigest()
+
+def get_cache_path(name, csv_paths):
+    """
+    Builds the Parquet cache path for a dataset derived from the given CSV files.
+
+    The file name is derived from CACHE_VERSION and the modification times of the source CSVs,
+    so editing any of them invalidates the cache automatically.
+
+    Parameters:
+    name (str): Name of the cached dataset (e.g. 'fraud').
+    csv_paths (list): Paths of the CSV files the dataset is derived from.
+
+    Returns:
+    str: Path of the cache file inside CACHE_DIR.
+    """
+    return os.path.join(CACHE_DIR, f'cache_{name}_{get_cache_key(csv_paths)}.parquet')
+
+def write_cache(data, name, cache_path):
+    """
+    Persists a dataset to its Parquet cache, replacing caches written for older source files.
+
+    Parameters:
+    data (DataFrame): The dataset to persist.
+    name (str): Name of the cached dataset, as passed to get_cache_path.
+    cache_path (str): Path returned by get_cache_path.
+    """
+    tmp_path = None
+    try:
+        # Remove caches written for older versions of the source files.
+        for stale_path in glob.glob(os.path.join(CACHE_DIR, f'cache_{name}_*.parquet')):
+            os.remove(stale_path)
+
+        # Write to a temporary file and rename it into place, so a crash mid-write or a process
+        # starting concurrently never sees a truncated cache under the final name.
+        tmp_path = f'{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        data.to_parquet(tmp_path, compression='zstd')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        # The dashboard still works without the cache, e.g. on a read-only filesystem.
+        print(f"Could not write {name} data cache: {e}")
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_cache(cache_path, **kwargs):
+    """
+    Reads a Parquet cache written by write_cache.
+
+    Parameters:
+    cache_path (str): Path returned by get_cache_path.
+    **kwargs: Extra arguments passed to pandas.read_parquet.
+
+    Returns:
+    DataFrame or None: The cached dataset, or None when the cache is missing or unreadable,
+    in which case the caller rebuilds it.
+    """
+    if not os.path.exists(cache_path):
+        return None
+    try:
+        return pd.read_parquet(cache_path, engine='pyarrow', **kwargs)
+    except (OSError, ValueError) as e:
+        # A damaged cache (e.g. left by an older, non-atomic write) is rebuilt and overwritten.
+        print(f"Ignoring unreadable cache {cache_path}: {e}")
+        return None
+
+@functools.lru_cache(maxsize=1)
+def get_processed_data():
+    """
+    Returns the processed eCommerce fraud data, reusing a Parquet cache of the processed frame
+    when the source CSVs have not changed. The result is cached for the lifetime of the process
+    and must not be modified by callers.
+
+    Returns:
+    DataFrame: The output of process_ecommerce_data.
+    """
+    cache_path = get_cache_path('fraud', [FRAUD_DATA_PATH, IP_COUNTRY_PATH])
+
+    # Fast path: memory-mapped columnar read of the already-typed, already-joined frame.
+    cached = read_cache(cache_path, memory_map=True)
+    if cached is not None:
+        return cached
+
+    # Slow path: parse the CSVs, run the pipeline and persist the result for the next start.
+    fraud_data, ip_country = load_data()
+    fraud_data_processed = process_ecommerce_data(fraud_data, ip_country)
+    write_cache(fraud_data_processed, 'fraud', cache_path)
+
+    return fraud_data_processed
+
+def get_geo_counts():
+    """
+    Returns the fraud cases per country, reusing a Parquet cache of the counts when the source
+    CSVs have not changed.
+
+    Returns:
+    DataFrame: The output of count_fraud_by_country for the full processed data.
+    """
+    cache_path = get_cache_path('geo', [FRAUD_DATA_PATH, IP_COUNTRY_PATH])
+
+    # Fast path: read the small per-country table instead of counting the transactions.
+    cached = read_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    # Slow path: count the processed data and persist the result for the next start.
+    geo_counts = count_fraud_by_country(get_processed_data())
+    write_cache(geo_counts, 'geo', cache_path)
+
+    return geo_counts
+
+def get_credit_counts():
+    """
+    Returns the credit card transaction and fraud counts, reusing a Parquet cache of the counts
+    when the credit card CSV has not changed.
+
+    Returns:
+    tuple: The total number of transactions and the number of fraudulent transactions.
+    """
+    cache_path = get_cache_path('credit', [CREDIT_DATA_PATH])
+
+    # Fast path: read the two counts instead of scanning the whole credit card CSV.
+    counts = read_cache(cache_path)
+    if counts is not None:
+        return int(counts['total'].iloc[0]), int(counts['frauds'].iloc[0])
+
+    # Slow path: stream the CSV and persist the counts for the next start.
+    total, frauds = summarize_credit_data(CREDIT_DATA_PATH)
+    write_cache(pd.DataFrame({'total': [total], 'frauds': [frauds]}), 'credit', cache_path)
+
+    return total, frauds
+
+def create_summary_stats(fraud_data, credit_counts):
+    """
+    Creates summary statistics for eCommerce fraud data and credit card transaction data.
+
+    Parameters:
+    fraud_data (DataFrame): A pandas DataFrame containing eCommerce fraud-related transactions.
+                           Assumes the 'class' column indicates fraud (1 for fraud, 0 otherwise).
+    credit_counts (tuple): Total and fraudulent credit card transaction counts,
+                           as returned by get_credit_counts.
+
+    Returns:
+    tuple: A tuple containing two dictionaries:
+        - ecom_stats: Summary statistics for the eCommerce fraud data.
+        - credit_stats: Summary statistics for the credit card transaction data.
+    """
+    # Calculate summary statistics for the eCommerce fraud data, summing the class column only once.
+    ecom_total = len(fraud_data)
+    ecom_frauds = int(fraud_data['class'].to_numpy().sum())
+    ecom_stats = {
+        'total_transactions': ecom_total,  # Total number of transactions in the dataset.
+        'fraud_cases': ecom_frauds,  # Total number of fraudulent transactions.
+        'fraud_percentage': round(ecom_frauds / ecom_total * 100, 2)  # Percentage of fraud cases.
+    }
+
+    # Calculate summary statistics for the credit card transaction data.
+    credit_total, credit_frauds = credit_counts
+    credit_stats = {
+        'total_transactions': credit_total,  # Total number of transactions in the dataset.
+        'fraud_cases': credit_frauds,  # Total number of fraudulent transactions.
+        'fraud_percentage': round(credit_frauds / credit_total * 100, 2)  # Percentage of fraud cases.
+    }
+
+    # Return the summary statistics for both datasets.
+    return ecom_stats, credit_stats
+
+@functools.lru_cache(maxsize=1)
+def get_summary_stats():
+    """
+    Returns the summary statistics for both datasets, computed once per process.
+
+    Returns:
+    tuple: The ecom_stats and credit_stats dictionaries produced by create_summary_stats.
+    """
+    return create_summary_stats(get_processed_data(), get_credit_counts())
+
+def compute_aggregates(data):
+    """
+    Computes the grouped tables behind every chart on the dashboard.
+
+    Parameters:
+    data (DataFrame): Processed eCommerce fraud data, optionally filtered by date or country.
+
+    Returns:
+    dict: Small aggregated frames keyed by chart ('trend', 'device', 'browser', 'hour', 'day').
+    """
+    # Restrict to fraudulent transactions once for the charts that only count fraud cases.
+    fraud_only = data[data['class'] == 1]
+    device_counts = data.groupby(['device_id', 'class'], observed=True).size().unstack(fill_value=0)
+
+    return {
+        # Fraud cases per calendar day, binned on the datetime64 values rather than date objects.
+        'trend': data.groupby(pd.Grouper(key='purchase_time', freq='D'))['class'].sum().reset_index(),
+        # Transaction counts per device and per browser, split by class. Only the busiest devices
+        # are kept: there is roughly one device per transaction, far more than a bar chart can show.
+        'device': device_counts.loc[device_counts.sum(axis=1).nlargest(TOP_DEVICES).index],
+        'browser': data.groupby(['browser', 'class'], observed=True).size().unstack(fill_value=0),
+        # Fraud cases per hour of day and per day of week.
+        'hour': fraud_only.groupby('purchase_hour').size(),
+        'day': fraud_only.groupby('purchase_day', observed=True).size()
+    }
+
+def count_fraud_by_country(data):
+    """
+    Counts the fraud cases per country for the choropleth.
+
+    Parameters:
+    data (DataFrame): Processed eCommerce fraud data.
+
+    Returns:
+    DataFrame: One row per country with at least one fraud case, with 'country' and 'count' columns.
+    """
+    # value_counts lists every category, so countries without fraud cases are dropped.
+    counts = data.loc[data['class'] == 1, 'country'].value_counts()
+    return counts[counts > 0].rename_axis('country').reset_index(name='count')
+
+def slice_date_range(data, start_date, end_date):
+    """
+    Selects the purchases made between two dates, both whole days and inclusive.
+
+    Parameters:
+    data (DataFrame): Processed eCommerce fraud data, sorted by purchase_time.
+    start_date (Timestamp): First purchase date to include.
+    end_date (Timestamp): Last purchase date to include.
+
+    Returns:
+    DataFrame: The rows within the date range.
+    """
+    # The rows are sorted by purchase time, so the range bounds can be binary-searched.
+    purchase_time = data['purchase_time'].to_numpy()
+    start = purchase_time.searchsorted(start_date.normalize().to_datetime64(), side='left')
+    end = purchase_time.searchsorted((end_date.normalize() + pd.Timedelta(days=1)).to_datetime64(), side='left')
+    return data.iloc[start:end]
+
+def compute_daily_aggregates(data):
+    """
+    Computes per-day versions of the chart aggregates, so that a date-range filter only has to
+    slice and re-sum these small tables instead of grouping the raw transactions again.
+
+    Parameters:
+    data (DataFrame): Processed eCommerce fraud data.
+
+    Returns:
+    dict: Aggregates keyed by chart ('trend', 'device', 'browser', 'hour'), each indexed by
+          purchase date first.
+    """
+    is_fraud = data['class'] == 1
+
+    return {
+        # Fraud cases per calendar day, including days without any transaction.
+        'trend': data.groupby(pd.Grouper(key='purchase_time', freq='D'))['class'].sum()
+        .rename_axis('purchase_date'),
+        # Transaction counts per day and device / browser, split by class.
+        'device': data.groupby(['purchase_date', 'device_id', 'class'], observed=True).size().unstack(fill_value=0),
+        'browser': data.groupby(['purchase_date', 'browser', 'class'], observed=True).size().unstack(fill_value=0),
+        # Fraud cases per day and hour of day.
+        'hour': data[is_fraud].groupby(['purchase_date', 'purchase_hour']).size()
+    }
+
+def aggregate_date_range(daily_aggregates, start_date, end_date):
+    """
+    Builds the chart aggregates for a date range from the output of compute_daily_aggregates.
+    Both ends of the range are whole days, inclusive.
+
+    Parameters:
+    daily_aggregates (dict): Output of compute_daily_aggregates.
+    start_date (Timestamp): First purchase date to include.
+    end_date (Timestamp): Last purchase date to include.
+
+    Returns:
+    dict: Aggregates keyed by chart, laid out like compute_aggregates.
+    """
+    start, end = start_date.normalize(), end_date.normalize()
+
+    # Slice each per-day table to the range, then sum the days away.
+    trend = daily_aggregates['trend'].loc[start:end]
+    device_counts = daily_aggregates['device'].loc[start:end].groupby(level='device_id', observed=True).sum()
+    browser_counts = daily_aggregates['browser'].loc[start:end].groupby(level='browser', observed=True).sum()
+    hour_counts = daily_aggregates['hour'].loc[start:end].groupby(level='purchase_hour').sum()
+
+    # Fraud cases per day of week follow from the daily trend; weekdays without fraud are left out.
+    day_counts = trend.groupby(trend.index.day_name().astype(WEEKDAY_DTYPE).rename('purchase_day'), observed=True).sum()
+
+    return {
+        'trend': trend.rename_axis('purchase_time').reset_index(),
+        'device': device_counts.loc[device_counts.sum(axis=1).nlargest(TOP_DEVICES).index],
+        'browser': browser_counts,
+        'hour': hour_counts,
+        'day': day_counts[day_counts > 0]
+    }
+
+def downsample_lttb(data, x, y, max_points):
+    """
+    Reduces a time series to at most max_points rows with the Largest-Triangle-Three-Buckets
+    algorithm, which keeps the points that preserve the visual shape of the line.
+
+    Parameters:
+    data (DataFrame): The series to downsample, sorted by the x column.
+    x (str): Name of the x column (numeric or datetime).
+    y (str): Name of the y column.
+    max_points (int): Maximum number of rows to keep.
+
+    Returns:
+    DataFrame: The selected rows of data, or data unchanged if it is already small enough.
+    """
+    n = len(data)
+    if max_points < 3 or n <= max_points:
+        return data
+
+    # Work on plain float arrays; datetimes are compared through their int64 representation.
+    xs = data[x].to_numpy().astype('int64' if data[x].dtype.kind == 'M' else 'float64').astype('float64')
+    ys = data[y].to_numpy().astype('float64')
+
+    # The first and last points are always kept; the interior is split into max_points - 2 buckets.
+    edges = np.linspace(1, n - 1, max_points - 1).astype('int64')
+    selected = np.empty(max_points, dtype='int64')
+    selected[0], selected[-1] = 0, n - 1
+
+    anchor = 0
+    for i in range(max_points - 2):
+        start, end = edges[i], edges[i + 1]
+
+        # Average of the next bucket (the last point for the final bucket).
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = xs[end:next_end].mean(), ys[end:next_end].mean()
+
+        # Keep the point forming the largest triangle with the previous pick and that average.
+        area = np.abs(
+            (xs[anchor] - avg_x) * (ys[start:end] - ys[anchor]) -
+            (xs[anchor] - xs[start:end]) * (avg_y - ys[anchor])
+        )
+        anchor = start + int(area.argmax())
+        selected[i + 1] = anchor
+
+    return data.iloc[selected]
@@ -0,0 +1,19 @@
+import os
+
+# Gunicorn settings for serving the dashboard: gunicorn --config gunicorn.conf.py dashboard_app:server
+
+# Listen on the port provided by the platform (e.g. Heroku), defaulting to Dash's port
+bind = f"0.0.0.0:{os.environ.get('PORT', '8050')}"
+
+# Several worker processes, each with a couple of threads, so callbacks from different users
+# (and the per-chart callbacks of a single user) run in parallel
+workers = max(2, (os.cpu_count() or 1) // 2)
+worker_class = 'gthread'
+threads = 2
+
+# Load the app (and the processed data) once in the master process before forking, so the workers
+# share that memory and the Parquet cache is built at most once
+preload_app = True
+
+# Building the caches from the CSVs on a cold start can take a while
+timeout = 120
@@ -0,0 +1,127 @@
+import queue
+import threading
+import time
+
+import torch
+
+
+class PendingRequest:
+    """
+    Rows submitted by one request, together with the slot its output is written to.
+    """
+    def __init__(self, rows):
+        self.rows = rows
+        self.output = None
+        self.error = None
+        self.done = threading.Event()
+
+
+class BatchedPredictor:
+    """
+    Runs a model on batches of rows collected from concurrent requests, so a single forward pass
+    serves many callers instead of paying the per-call framework overhead once per request.
+
+    Parameters:
+    model (torch.nn.Module): Model applied to each batch; it must accept a 2-D (rows, features) tensor.
+    max_batch (int): Maximum number of rows run in one forward pass.
+    max_wait_ms (float): How long the first request of a batch waits for others to join it.
+    """
+    def __init__(self, model, max_batch=32, max_wait_ms=5):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.requests = queue.Queue()
+        self.worker = None
+        self.worker_lock = threading.Lock()
+        # Input buffer reused by every forward pass; only the worker thread touches it
+        self.input_buffer = None
+
+    def predict(self, rows, timeout=None):
+        """
+        Submits rows for prediction and waits for the model output.
+
+        Parameters:
+        rows (torch.Tensor): 2-D tensor with one row per sample.
+        timeout (float, optional): Seconds to wait for the result before giving up.
+
+        Returns:
+        torch.Tensor: Model output for the submitted rows, in the same order.
+        """
+        if rows.dim() != 2:
+            raise ValueError(f"Expected a 2-D tensor of rows, got shape {tuple(rows.shape)}")
+
+        self._ensure_worker()
+        request = PendingRequest(rows)
+        self.requests.put(request)
+
+        if not request.done.wait(timeout):
+            raise TimeoutError("Timed out waiting for the batched prediction")
+        if request.error is not None:
+            raise request.error
+        return request.output
+
+    def _ensure_worker(self):
+        # The worker thread is started lazily, so a predictor created before a server forks its
+        # worker processes still gets a running thread in each of them.
+        with self.worker_lock:
+            if self.worker is None or not self.worker.is_alive():
+                self.worker = threading.Thread(target=self._run, daemon=True)
+                self.worker.start()
+
+    def _collect_batch(self):
+        # Block for the first request, then gather more until the batch is full or the wait is over.
+        batch = [self.requests.get()]
+        num_rows = batch[0].rows.size(0)
+        deadline = time.monotonic() + self.max_wait
+
+        while num_rows < self.max_batch:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                request = self.requests.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            num_rows += request.rows.size(0)
+
+        return batch
+
+    def _batch_input(self, batch):
+        # Concatenate the rows into a slice of the preallocated buffer, so a typical batch needs no new
+        # allocation. Batches larger than max_batch or with an unexpected width get a tensor of their own.
+        rows = [request.rows for request in batch]
+        num_rows = sum(r.size(0) for r in rows)
+        num_features = rows[0].size(1)
+
+        if self.input_buffer is None:
+            self.input_buffer = torch.empty(self.max_batch, num_features, dtype=rows[0].dtype)
+        buffer = self.input_buffer
+        if num_rows > buffer.size(0) or any(r.size(1) != buffer.size(1) or r.dtype != buffer.dtype for r in rows):
+            return torch.cat(rows)
+        return torch.cat(rows, out=buffer[:num_rows])
+
+    def _forward(self, batch):
+        # One forward pass over the concatenated rows, split back into one output per request.
+        with torch.inference_mode():
+            outputs = self.model(self._batch_input(batch))
+        return outputs.split([request.rows.size(0) for request in batch])
+
+    def _run(self):
+        while True:
+            batch = self._collect_batch()
+            try:
+                outputs = self._forward(batch)
+            except Exception:
+                # Run the requests one by one, so a malformed request only fails itself.
+                outputs = []
+                for request in batch:
+                    try:
+                        outputs.append(self._forward([request])[0])
+                    except Exception as e:
+                        request.error = e
+                        outputs.append(None)
+
+            for request, output in zip(batch, outputs):
+                request.output = output
+                request.done.set()
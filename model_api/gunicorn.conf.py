@@ -0,0 +1,21 @@
+import os
+
+# Gunicorn settings for serving the model API: gunicorn --config gunicorn.conf.py serve_model:app
+
+# Listen on the port exposed by the Docker image, unless the platform provides one
+bind = f"0.0.0.0:{os.environ.get('PORT', '5000')}"
+
+# Pin the OpenMP/MKL thread pools before the app (and torch) is imported, so each worker uses a
+# single compute thread instead of every worker spawning one thread per core
+os.environ.setdefault('OMP_NUM_THREADS', '1')
+os.environ.setdefault('MKL_NUM_THREADS', '1')
+
+# One worker process per core, each with a few threads, so predictions run in parallel instead of
+# being serialized by the development server. The threads only wait on I/O and on the batching
+# worker, which groups their requests into a single forward pass.
+workers = os.cpu_count() or 1
+worker_class = 'gthread'
+threads = 4
+
+# Load the models once in the master process before forking, so the workers share them
+preload_app = True
@@ -8,10 +8,41 @@ class RNNModel(torch.nn.Module):
 
     def forward(self, x):
         x = x.unsqueeze(1)  # Add sequence dimension
-        h0 = torch.zeros(1, x.size(0), 32)  # Initial hidden state
-        out, _ = self.rnn(x, h0)
+        out, _ = self.rnn(x)  # Starts from a zero hidden state, created on the input's device
         out = torch.sigmoid(self.fc(out[:, -1, :]))
         return out
 
 
+class SingleStepRNNModel(torch.nn.Module):
+    """
+    Inference-only equivalent of RNNModel. RNNModel runs its RNN for a single time step from a zero
+    hidden state, which reduces to tanh(W_ih x + b_ih + b_hh), so the recurrent layer is replaced by
+    one Linear layer and no hidden state has to be allocated per call.
+    """
+    def __init__(self, input_size, hidden_size=32):
+        super(SingleStepRNNModel, self).__init__()
+        self.input_proj = torch.nn.Linear(input_size, hidden_size)
+        self.fc = torch.nn.Linear(hidden_size, 1)
 
+    def forward(self, x):
+        return torch.sigmoid(self.fc(torch.tanh(self.input_proj(x))))
+
+    @classmethod
+    def from_rnn(cls, rnn_model):
+        """
+        Builds the equivalent single-step model from a trained RNNModel.
+
+        Parameters:
+        rnn_model (RNNModel): Trained model to copy the weights from.
+
+        Returns:
+        SingleStepRNNModel: Model in eval mode producing the same outputs as rnn_model.
+        """
+        rnn = rnn_model.rnn
+        model = cls(rnn.input_size, rnn.hidden_size)
+        with torch.no_grad():
+            # The hidden-to-hidden weights multiply the zero initial state, so only their bias remains.
+            model.input_proj.weight.copy_(rnn.weight_ih_l0)
+            model.input_proj.bias.copy_(rnn.bias_ih_l0 + rnn.bias_hh_l0)
+            model.fc.load_state_dict(rnn_model.fc.state_dict())
+        return model.eval()
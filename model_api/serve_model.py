@@ -1,13 +1,34 @@
 from flask import Flask, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 import torch
 import joblib
-import torch.nn.functional as F
 import numpy as np
-from model_definitions import RNNModel
+import orjson
+from model_definitions import RNNModel, SingleStepRNNModel
+from batching import BatchedPredictor
+from tree_predictor import DecisionTreePredictor
+import functools
 import logging
+import os
+import __main__
+
+# Configure PyTorch's thread pools before any torch work, since set_num_interop_threads fails once the
+# interop pool has started. Each forward pass is tiny, so by default a single intra-op thread per worker
+# avoids thread start-up and oversubscribing the cores that the other gunicorn workers run on
+torch.set_num_threads(int(os.environ.get('TORCH_NUM_THREADS', '1')))
+torch.set_num_interop_threads(1)
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    Parses request bodies with orjson, which decodes the feature lists in C rather than in the
+    standard library's Python-level parser. Responses keep Flask's default encoder.
+    """
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
 
 # Initialize Flask app
 app = Flask(__name__)
+app.json = OrjsonProvider(app)
 
 # Configure logging
 logging.basicConfig(
@@ -16,16 +37,64 @@ logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s'
 )
 
-input_size = 100  
+# Resolve the models relative to this file, so the API starts from any working directory
+# (the repository root, the Docker image's /app, or a gunicorn worker)
+MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'models')
+
+# Load the fraud model (with gunicorn's preload_app it is loaded once, before the workers fork)
+fraud_model = joblib.load(os.path.join(MODEL_DIR, 'DecisionTree_Fraud.joblib'))
+
+# Walk the tree directly for single records, skipping scikit-learn's per-call input validation
+fraud_predictor = DecisionTreePredictor(fraud_model)
 
-# Load the fraud model
-fraud_model = joblib.load('model_api/models/DecisionTree_Fraud.joblib')
+# The credit card model was pickled from a notebook, so it refers to its class as __main__.RNNModel;
+# expose the class there as well when __main__ is not this module (e.g. under gunicorn)
+if not hasattr(__main__, 'RNNModel'):
+    __main__.RNNModel = RNNModel
 
-# Load the credit card model
-creditcard_model = RNNModel(input_size)
-creditcard_model = torch.load('model_api/models/RNN_Credit.pt')
+# Load the credit card model. It is a whole pickled module (a trusted repository artifact), which
+# torch >= 2.6 only unpickles with weights_only=False
+creditcard_model = torch.load(os.path.join(MODEL_DIR, 'RNN_Credit.pt'), weights_only=False)
 creditcard_model.eval()
 
+# The RNN only ever runs one time step, so serve the equivalent feed-forward model
+creditcard_model = SingleStepRNNModel.from_rnn(creditcard_model)
+input_size = creditcard_model.input_proj.in_features
+
+# Compile the model to TorchScript and freeze it, inlining the weights as constants so the graph
+# can be optimized for inference and per-call Python dispatch overhead disappears
+creditcard_model = torch.jit.optimize_for_inference(torch.jit.freeze(torch.jit.script(creditcard_model)))
+
+# Run one prediction at startup so the first request does not pay for the JIT's specialization
+with torch.inference_mode():
+    creditcard_model(torch.zeros(1, input_size))
+
+# Concurrent credit card requests are grouped into a single forward pass. BATCH_SIZE caps the rows
+# per pass and BATCH_TIMEOUT_MS is how long the first request waits for others to join it.
+creditcard_predictor = BatchedPredictor(
+    creditcard_model,
+    max_batch=int(os.environ.get('BATCH_SIZE', '32')),
+    max_wait_ms=float(os.environ.get('BATCH_TIMEOUT_MS', '5'))
+)
+
+# Number of distinct single-record requests per model whose predictions are kept in memory, so
+# repeated feature vectors (client retries, duplicate transactions) skip the model entirely
+PREDICTION_CACHE_SIZE = 10_000
+
+@functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def predict_fraud_record(features):
+    return fraud_predictor.predict_one(features)
+
+def predict_creditcard_rows(rows):
+    # The model already ends in a sigmoid and outputs one fraud probability per row; a softmax over
+    # that single column would always return 1, so report [P(legitimate), P(fraud)] instead
+    fraud_probability = creditcard_predictor.predict(torch.from_numpy(rows), timeout=10)
+    return torch.cat([1 - fraud_probability, fraud_probability], dim=1).tolist()
+
+@functools.lru_cache(maxsize=PREDICTION_CACHE_SIZE)
+def predict_creditcard_record(row):
+    return predict_creditcard_rows(np.asarray([row], dtype=np.float32))
+
 @app.route('/favicon.ico')
 def favicon():
     return send_from_directory('static', 'favicon.ico')
@@ -39,13 +108,13 @@ def home():
 def predict_fraud():
     try:
         data = request.get_json()
-        features = np.array(data['features']).reshape(1, -1)
-        prediction = fraud_model.predict(features)
+        features = tuple(np.asarray(data['features']).ravel().tolist())
+        prediction = predict_fraud_record(features)
         
         app.logger.info(f"Fraud prediction request received with data: {data}")
-        app.logger.info(f"Fraud prediction result: {prediction[0]}")
+        app.logger.info(f"Fraud prediction result: {prediction}")
         
-        return jsonify({'prediction': prediction[0]})
+        return jsonify({'prediction': prediction})
     except Exception as e:
         app.logger.error(f"Error in fraud prediction: {e}")
         return jsonify({'error': str(e)}), 500
@@ -53,12 +122,22 @@ def predict_fraud():
 @app.route('/predict/creditcard', methods=['POST'])
 def predict_creditcard():
     try:
-        data = request.json['data']
-        input_tensor = torch.tensor(data, dtype=torch.float32)
+        if request.mimetype == 'application/octet-stream':
+            # Raw little-endian float32 rows skip JSON entirely and are read straight into an array
+            rows = np.frombuffer(bytearray(request.get_data()), dtype='<f4').reshape(-1, input_size)
+            data = f"<{rows.shape[0]} binary rows>"
+        else:
+            data = request.json['data']
+            # Convert the rows to float32 once and share that buffer with torch instead of copying it again
+            rows = np.asarray(data, dtype=np.float32)
+        if rows.ndim == 1:
+            rows = rows[None, :]  # A single record becomes a batch of one
         
-        with torch.no_grad():
-            output = creditcard_model(input_tensor)
-            probabilities = torch.softmax(output, dim=1).numpy().tolist()
+        # Single records are answered from the prediction cache when seen before; batches run as is
+        if rows.shape[0] == 1:
+            probabilities = predict_creditcard_record(tuple(rows[0].tolist()))
+        else:
+            probabilities = predict_creditcard_rows(rows)
         
         app.logger.info(f"Credit card prediction request received with data: {data}")
         app.logger.info(f"Credit card prediction probabilities: {probabilities}")
@@ -68,5 +147,8 @@ def predict_creditcard():
         app.logger.error(f"Error in credit card prediction: {e}")
         return jsonify({'error': str(e)}), 500
 
+# Run the Flask development server; deploy with gunicorn instead
 if __name__ == '__main__':
-    app.run(debug=True)
+    print("Development server only. In production run: gunicorn --config gunicorn.conf.py serve_model:app")
+    # The reloader would re-import this module in a child process, loading the models twice
+    app.run(debug=True, use_reloader=False)
@@ -0,0 +1,50 @@
+import numpy as np
+
+
+class DecisionTreePredictor:
+    """
+    Predicts single records with a fitted scikit-learn DecisionTreeClassifier by walking its node
+    arrays directly. For one record, DecisionTreeClassifier.predict spends most of its time in input
+    validation and array conversion rather than in the tree traversal itself.
+
+    Parameters:
+    model (DecisionTreeClassifier): Fitted single-output classifier.
+    """
+    def __init__(self, model):
+        tree = model.tree_
+        self.n_features = model.n_features_in_
+        self.children_left = tree.children_left
+        self.children_right = tree.children_right
+        self.feature = tree.feature
+        self.threshold = tree.threshold
+
+        # Predicted class of every node, so a leaf only needs a lookup.
+        self.node_labels = model.classes_.take(tree.value[:, 0, :].argmax(axis=1))
+
+    def predict_one(self, features):
+        """
+        Predicts the class of a single record.
+
+        Parameters:
+        features (array-like): The record's feature values, in training column order.
+
+        Returns:
+        The predicted class label, as a plain Python value.
+        """
+        # scikit-learn evaluates the splits on float32 inputs, so do the same to get identical results.
+        x = np.asarray(features, dtype=np.float32).ravel()
+        if x.shape[0] != self.n_features:
+            raise ValueError(f"Expected {self.n_features} features, got {x.shape[0]}")
+        # NaN fails every split test and would silently descend right; reject it like scikit-learn does
+        if not np.isfinite(x).all():
+            raise ValueError("Input contains NaN or infinity")
+
+        node = 0
+        # Leaves have no children (-1); descend left when the feature is at or below the threshold.
+        while self.children_left[node] != -1:
+            if x[self.feature[node]] <= self.threshold[node]:
+                node = self.children_left[node]
+            else:
+                node = self.children_right[node]
+
+        return self.node_labels[node].item()
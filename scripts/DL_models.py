@@ -1,5 +1,6 @@
 import torch
 import torch.nn as nn
+import torch.nn.functional as F
 
 # Model definitions (MLP, CNN, RNN, LSTM)
 class MLPModel(nn.Module):
@@ -37,10 +38,11 @@ class RNNModel(nn.Module):
         self.fc = nn.Linear(32, 1)
 
     def forward(self, x):
-        x = x.unsqueeze(1)  # Add sequence dimension
-        h0 = torch.zeros(1, x.size(0), 32)  # Initial hidden state
-        out, _ = self.rnn(x, h0)
-        out = torch.sigmoid(self.fc(out[:, -1, :]))
+        # Each row is a sequence of length 1 starting from a zero hidden state, so the recurrence reduces
+        # to one step, h = tanh(W_ih x + b_ih + b_hh); computing it directly skips nn.RNN's sequence
+        # handling while keeping the nn.RNN parameters, so saved models still load
+        h = torch.tanh(F.linear(x, self.rnn.weight_ih_l0, self.rnn.bias_ih_l0 + self.rnn.bias_hh_l0))
+        out = torch.sigmoid(self.fc(h))
         return out
 
 class LSTMModel(nn.Module):
@@ -50,9 +52,11 @@ class LSTMModel(nn.Module):
         self.fc = nn.Linear(32, 1)
 
     def forward(self, x):
-        x = x.unsqueeze(1)  # Add sequence dimension
-        h0 = torch.zeros(1, x.size(0), 32)  # Initial hidden state
-        c0 = torch.zeros(1, x.size(0), 32)  # Initial cell state
-        out, _ = self.lstm(x, (h0, c0))
-        out = torch.sigmoid(self.fc(out[:, -1, :]))
+        # Same single step for the LSTM: with zero initial states the forget gate has nothing to keep,
+        # so c = i * g and h = o * tanh(c), with all four gates from one fused linear layer
+        gates = F.linear(x, self.lstm.weight_ih_l0, self.lstm.bias_ih_l0 + self.lstm.bias_hh_l0)
+        i, _, g, o = gates.chunk(4, dim=1)
+        c = torch.sigmoid(i) * torch.tanh(g)
+        h = torch.sigmoid(o) * torch.tanh(c)
+        out = torch.sigmoid(self.fc(h))
         return out
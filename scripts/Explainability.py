@@ -6,8 +6,9 @@ import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import torch
-import torch.nn.functional as F
 import joblib
+import functools
+import pickle
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler
 
@@ -16,18 +17,35 @@ sys.path.append('../scripts')  # Appending the path to access the scripts folder
 from DL_models import * 
 
 
-# Load PyTorch models
+# Read a saved PyTorch file once; mmap maps the tensor storages from the file instead of copying them.
+# A state_dict loads with weights_only=True; the repository's trusted model files are whole pickled
+# modules, which only unpickle with weights_only=False.
+@functools.lru_cache(maxsize=8)
+def load_pytorch_file(model_path):
+    try:
+        return torch.load(model_path, map_location='cpu', mmap=True, weights_only=True)
+    except pickle.UnpicklingError:
+        return torch.load(model_path, map_location='cpu', mmap=True, weights_only=False)
+
+# Load PyTorch models. A pickled module is returned straight from the cache, so repeated loads share
+# its memory-mapped weights: treat it as read-only, and deep-copy it before training or modifying it.
+# A saved state_dict is loaded into a newly built model on every call.
 def load_pytorch_model(model_name, model_dir, input_size):
     model_path = f"{model_dir}/{model_name}.pt"
-    if "MLP" in model_name:
-        model = MLPModel(input_size)
-    elif "CNN" in model_name:
-        model = CNNModel(input_size)
-    elif "RNN" in model_name:
-        model = RNNModel(input_size)
-    elif "LSTM" in model_name:
-        model = LSTMModel(input_size)
-    model = torch.load(model_path)
+    model = load_pytorch_file(model_path)
+
+    if isinstance(model, dict):
+        state_dict = model
+        if "MLP" in model_name:
+            model = MLPModel(input_size)
+        elif "CNN" in model_name:
+            model = CNNModel(input_size)
+        elif "RNN" in model_name:
+            model = RNNModel(input_size)
+        elif "LSTM" in model_name:
+            model = LSTMModel(input_size)
+        model.load_state_dict(state_dict)
+
     model.eval()  # Set model to evaluation mode
     return model
 
@@ -37,26 +55,73 @@ def load_sklearn_model(model_name, model_dir):
     model = joblib.load(model_path)
     return model
 
-# Function to get SHAP values for PyTorch models
-def get_shap_values_pytorch(model, X, num_samples=100):
+# Function to get SHAP values for PyTorch models. By default they are approximated with Integrated
+# Gradients (method='ig'), which needs only batched gradient passes; method='shap' runs SHAP's
+# GradientExplainer instead, e.g. to cross-check the attributions.
+def get_shap_values_pytorch(model, X, num_samples=100, background_size=10, method='ig'):
+    if method == 'ig':
+        return get_integrated_gradients_pytorch(model, X, num_samples=num_samples)
+    if method != 'shap':
+        raise ValueError(f"Unknown attribution method {method!r}; expected 'ig' or 'shap'")
+
     # Ensure the model is in evaluation mode
     model.eval()
-    
-    # Wrapper function for model predictions in the SHAP-compatible format
-    def model_predict(x):
-        x_tensor = torch.from_numpy(x).float()
-        with torch.no_grad():
-            logits = model(x_tensor)  # Get logits
-            probabilities = F.softmax(logits, dim=1)  # Apply softmax for probabilities over classes
-        return probabilities.numpy()
-
-    # KernelExplainer for SHAP with general model compatibility
-    explainer = shap.KernelExplainer(model_predict, X[:num_samples].astype(np.float32))
-    shap_values = explainer.shap_values(X[:num_samples].astype(np.float32))
-    
+
+    X = np.asarray(X, dtype=np.float32)
+    samples = torch.from_numpy(X[:num_samples])
+
+    # Every sample is explained against every background row, so summarize the background to a few
+    # k-means centroids instead of passing raw rows
+    centroids = shap.kmeans(X, background_size).data
+    background = torch.from_numpy(centroids.astype(np.float32))
+
+    # GradientExplainer (expected gradients) explains all samples with a few batched forward/backward
+    # passes instead of one model call per perturbed row. DeepExplainer is not an option: its rules hook
+    # nn.ReLU/nn.Sigmoid modules, while these models apply torch.relu/torch.sigmoid as functions.
+    explainer = shap.GradientExplainer(model, background)
+    shap_values = explainer.shap_values(samples)
+
+    # The models have a single sigmoid output; drop its axis so the values are (samples, features)
+    if isinstance(shap_values, list):
+        shap_values = shap_values[0]
+    shap_values = np.asarray(shap_values)
+    if shap_values.ndim == 3:
+        shap_values = shap_values[..., 0]
+
     return shap_values
 
 
+# Function to get Integrated Gradients attributions for PyTorch models
+def get_integrated_gradients_pytorch(model, X, num_samples=100, n_steps=32, internal_batch_size=256):
+    # Ensure the model is in evaluation mode
+    model.eval()
+
+    X = np.asarray(X, dtype=np.float32)
+    samples = torch.from_numpy(X[:num_samples])
+    num_rows = samples.size(0)
+
+    # Attributions are measured against the average row, as SHAP measures them against the expected output
+    baseline = torch.from_numpy(X.mean(axis=0))
+
+    # Gradients at points along the straight line from the baseline to every sample (midpoints of n_steps
+    # intervals). The n_steps * num_samples points are evaluated internal_batch_size at a time, each batch
+    # with one forward and backward pass, so memory stays bounded however many samples are explained.
+    alphas = (torch.arange(n_steps, dtype=torch.float32) + 0.5) / n_steps
+    gradient_sums = torch.zeros_like(samples)
+    for start in range(0, n_steps * num_rows, internal_batch_size):
+        point_index = torch.arange(start, min(start + internal_batch_size, n_steps * num_rows))
+        step, row = point_index // num_rows, point_index % num_rows
+        points = baseline + alphas[step].unsqueeze(1) * (samples[row] - baseline)
+        points.requires_grad_()
+        gradients, = torch.autograd.grad(model(points).sum(), points)
+        gradient_sums.index_add_(0, row, gradients)
+
+    # Average gradient along the path times the distance travelled; the values are (samples, features)
+    attributions = (samples - baseline) * gradient_sums / n_steps
+
+    return attributions.numpy()
+
+
 # Function to predict probabilities for binary classification with PyTorch
 def pytorch_predict_proba_binary(model, data):
     model.eval()
@@ -1,9 +1,9 @@
 import torch
+import numpy as np
 import pandas as pd
 import mlflow
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
 from imblearn.over_sampling import SMOTE
-from sklearn.utils import shuffle
 
 
 
@@ -21,9 +21,11 @@ def augment_and_merge_data(original_data, target_column, num_samples=None, rando
     Returns:
         pd.DataFrame: Augmented and shuffled dataset containing both original and synthetic data.
     """
-    # Separate features and target
-    X = original_data.drop(columns=[target_column])
-    y = original_data[target_column]
+    # Separate features and target, as plain arrays so SMOTE and the merge below avoid pandas copies.
+    # Features become float64, so mixed bool/int/float frames stay numeric and SMOTE's interpolated values are kept
+    feature_columns = original_data.columns.drop(target_column)
+    X = original_data[feature_columns].to_numpy(dtype=np.float64)
+    y = original_data[target_column].to_numpy()
 
     # Instantiate SMOTE
     smote = SMOTE(sampling_strategy='auto', random_state=random_state)
@@ -32,27 +34,53 @@ def augment_and_merge_data(original_data, target_column, num_samples=None, rando
     print("Applying SMOTE to generate synthetic samples...")
     X_resampled, y_resampled = smote.fit_resample(X, y)
     
-    # Combine features and target back into a DataFrame
-    synthetic_data = pd.DataFrame(X_resampled, columns=X.columns)
-    synthetic_data[target_column] = y_resampled
+    # SMOTE returns the original rows first, followed by the generated ones
+    num_original = len(X)
+    X_synthetic = X_resampled[num_original:]
+    y_synthetic = y_resampled[num_original:]
     
-    # Ensure no duplicate rows are added
-    synthetic_data = synthetic_data[~synthetic_data.isin(original_data)].dropna(how='all')
+    # Ensure no duplicate rows are added: keep only the generated rows that match neither an original
+    # row nor an earlier generated one (np.unique reports the first occurrence of every row)
+    rows = np.column_stack([np.vstack([X, X_synthetic]), np.concatenate([y, y_synthetic])])
+    _, first_index = np.unique(rows, axis=0, return_index=True)
+    is_new = np.zeros(len(rows), dtype=bool)
+    is_new[first_index] = True
+    is_new = is_new[num_original:]
+    X_synthetic, y_synthetic = X_synthetic[is_new], y_synthetic[is_new]
     
-    # Limit synthetic data size if num_samples is specified
+    # Limit synthetic data size if num_samples is specified (the same draw as DataFrame.sample(n=num_samples))
     if num_samples:
-        synthetic_data = synthetic_data.sample(n=num_samples, random_state=random_state)
+        keep = np.random.RandomState(random_state).choice(len(X_synthetic), size=num_samples, replace=False)
+        X_synthetic, y_synthetic = X_synthetic[keep], y_synthetic[keep]
     
     # Merge with original data
     print("Merging synthetic and original data...")
-    augmented_data = pd.concat([original_data, synthetic_data], ignore_index=True)
+    X_merged = np.vstack([X, X_synthetic])
+    y_merged = np.concatenate([y, y_synthetic])
     
-    # Shuffle the data
+    # Shuffle the data (the same order as DataFrame.sample(frac=1))
     print("Shuffling merged dataset...")
-    augmented_data = shuffle(augmented_data, random_state=random_state)
+    order = np.random.RandomState(random_state).choice(len(X_merged), size=len(X_merged), replace=False)
+    X_merged, y_merged = X_merged[order], y_merged[order]
+    
+    # Build the DataFrame once, in the original column order. Integer and bool features get their dtype
+    # back when every value is still integral (or 0/1); columns holding interpolated values stay float64.
+    augmented_data = pd.DataFrame(X_merged, columns=feature_columns)
+    for column in feature_columns:
+        dtype = original_data[column].dtype
+        values = augmented_data[column].to_numpy()
+        if pd.api.types.is_bool_dtype(dtype):
+            if np.isin(values, (0, 1)).all():
+                augmented_data[column] = values.astype(bool)
+        elif pd.api.types.is_integer_dtype(dtype):
+            if np.array_equal(values, np.round(values)):
+                augmented_data[column] = values.astype(dtype)
+    augmented_data[target_column] = y_merged.astype(original_data[target_column].dtype)
+    augmented_data = augmented_data[original_data.columns]
+    synthetic_shape = (len(X_synthetic), original_data.shape[1])
     
     print("Original data shape:", original_data.shape)
-    print("Synthetic data shape:", synthetic_data.shape)
+    print("Synthetic data shape:", synthetic_shape)
     print("Augmented data shape:", augmented_data.shape)
     # Return the augmented dataset
     print("Data augmentation and merging completed.")
@@ -87,19 +115,22 @@ class EarlyStopping:
 def train_model(model, train_loader, optimizer, criterion, num_epochs=20, patience=3, model_name="model"):
     early_stopper = EarlyStopping(patience=patience)
     model.train()
+    num_batches = len(train_loader)
+    device = next(model.parameters()).device
     
     with mlflow.start_run(run_name=model_name):
         for epoch in range(num_epochs):
-            total_loss = 0
+            # Sum the losses as a tensor and read it once per epoch, rather than syncing on every batch
+            total_loss = torch.zeros((), device=device)
             for X_batch, y_batch in train_loader:
-                optimizer.zero_grad()  # Clear gradients
+                optimizer.zero_grad(set_to_none=True)  # Clear gradients
                 y_pred = model(X_batch).squeeze()  # Forward pass
                 loss = criterion(y_pred, y_batch)  # Compute loss
                 loss.backward()  # Backward pass
                 optimizer.step()  # Update weights
-                total_loss += loss.item()
+                total_loss += loss.detach()
 
-            avg_loss = total_loss / len(train_loader)
+            avg_loss = total_loss.item() / num_batches
             print(f'Epoch [{epoch+1}/{num_epochs}], Loss: {avg_loss:.4f}')
             
             # Log loss for each epoch
@@ -115,15 +146,19 @@ def train_model(model, train_loader, optimizer, criterion, num_epochs=20, patien
 # Updated PyTorch model evaluation function
 def evaluate_model(model, test_loader):
     model.eval()  # Set to evaluation mode
-    all_preds = []
-    all_labels = []
+    pred_batches = []
+    label_batches = []
 
-    with torch.no_grad():
+    with torch.inference_mode():
         for X_batch, y_batch in test_loader:
-            y_pred = model(X_batch).squeeze()
+            y_pred = model(X_batch).view(-1)
             preds = (y_pred > 0.5).float()  # Convert probabilities to 0/1
-            all_preds.extend(preds.numpy())
-            all_labels.extend(y_batch.numpy())
+            pred_batches.append(preds.cpu())
+            label_batches.append(y_batch.view(-1).cpu())
+
+    # Concatenate the batches once instead of extending Python lists element by element
+    all_preds = torch.cat(pred_batches).numpy()
+    all_labels = torch.cat(label_batches).numpy()
     
     accuracy = accuracy_score(all_labels, all_preds)
     precision = precision_score(all_labels, all_preds, average='macro')
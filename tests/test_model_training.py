@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+
+try:
+    from model_training import augment_and_merge_data
+except ImportError:  # torch, mlflow or imblearn missing
+    augment_and_merge_data = None
+
+
+@unittest.skipIf(augment_and_merge_data is None, "model_training dependencies are not installed")
+class AugmentAndMergeDataTest(unittest.TestCase):
+    def make_data(self):
+        # Mixed float, int and bool (one-hot) features, like the notebook's fraud frame
+        rng = np.random.default_rng(0)
+        n = 60
+        return pd.DataFrame({
+            'purchase_value': rng.normal(40, 10, n),
+            'hour_of_day': rng.integers(0, 24, n),
+            'source_SEO': rng.integers(0, 2, n).astype(bool),
+            'channel': np.ones(n, dtype=np.int64),
+            'is_mobile': np.zeros(n, dtype=bool),
+            'class': np.r_[np.ones(10, dtype=int), np.zeros(n - 10, dtype=int)],
+        })
+
+    def test_mixed_dtypes_are_augmented_without_truncation(self):
+        data = self.make_data()
+        augmented = augment_and_merge_data(data, 'class')
+
+        self.assertEqual(list(augmented.columns), list(data.columns))
+        self.assertEqual(augmented['class'].dtype, data['class'].dtype)
+        # Only minority rows are generated, at most up to the majority count, and every original row is kept
+        self.assertEqual((augmented['class'] == 0).sum(), (data['class'] == 0).sum())
+        self.assertGreater((augmented['class'] == 1).sum(), (data['class'] == 1).sum())
+        self.assertLessEqual((augmented['class'] == 1).sum(), (data['class'] == 0).sum())
+        merged = augmented.merge(data.astype({'hour_of_day': float, 'source_SEO': float}), how='inner')
+        self.assertEqual(len(merged), len(data))
+
+        # Interpolated values of the int and bool columns are kept as floats, not truncated or cast to True
+        for column in ['hour_of_day', 'source_SEO']:
+            self.assertEqual(augmented[column].dtype, np.float64)
+        self.assertFalse(np.all(augmented['hour_of_day'] == np.round(augmented['hour_of_day'])))
+
+        # Int and bool columns whose values all stay integral keep their original dtype
+        self.assertEqual(augmented['channel'].dtype, data['channel'].dtype)
+        self.assertEqual(augmented['is_mobile'].dtype, data['is_mobile'].dtype)
+
+    def test_generated_rows_are_not_duplicated(self):
+        augmented = augment_and_merge_data(self.make_data(), 'class')
+        self.assertFalse(augmented.duplicated().any())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+MODEL_API_DIR = os.path.join(os.path.dirname(__file__), '..', 'model_api')
+sys.path.append(MODEL_API_DIR)
+
+from tree_predictor import DecisionTreePredictor
+
+try:
+    import joblib
+    import sklearn  # noqa: F401  (needed to unpickle the model)
+except ImportError:
+    joblib = None
+
+
+@unittest.skipIf(joblib is None, "joblib and scikit-learn are not installed")
+class DecisionTreePredictorTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = joblib.load(os.path.join(MODEL_API_DIR, 'models', 'DecisionTree_Fraud.joblib'))
+        cls.predictor = DecisionTreePredictor(cls.model)
+
+    def assert_matches_model(self, rows):
+        expected = self.model.predict(rows)
+        for row, label in zip(rows, expected):
+            self.assertEqual(self.predictor.predict_one(row), label.item())
+
+    def test_random_rows(self):
+        rng = np.random.default_rng(0)
+        n_features = self.model.n_features_in_
+        self.assert_matches_model(rng.normal(0, 3, size=(500, n_features)))
+
+    def test_rows_on_split_thresholds(self):
+        # Rows sitting exactly on a split threshold must descend left, as in scikit-learn
+        tree = self.model.tree_
+        internal = np.flatnonzero(tree.children_left != -1)[:50]
+        rows = np.zeros((len(internal), self.model.n_features_in_))
+        rows[np.arange(len(internal)), tree.feature[internal]] = tree.threshold[internal]
+        self.assert_matches_model(rows)
+
+    def test_non_finite_features_are_rejected(self):
+        row = [0.0] * self.model.n_features_in_
+        for value in [np.nan, None, np.inf]:
+            row[0] = value
+            with self.assertRaises(ValueError):
+                self.predictor.predict_one(row)
+
+    def test_wrong_feature_count_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.predictor.predict_one([0.0] * (self.model.n_features_in_ + 1))
+
+
+if __name__ == '__main__':
+    unittest.main()